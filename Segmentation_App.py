@@ -2,13 +2,226 @@ import sys
 import cv2
 import os
 import numpy as np
+from queue import Queue
+from concurrent.futures import ThreadPoolExecutor
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QLabel, QPushButton, QFileDialog, QVBoxLayout, QSlider,
     QHBoxLayout, QWidget, QMessageBox, QDialog, QCheckBox, QScrollArea, QGridLayout,
     QFrame, QComboBox, QSpinBox, QDoubleSpinBox, QGroupBox, QLineEdit
 )
-from PyQt5.QtGui import QPixmap, QImage, QPalette, QColor, QIntValidator
-from PyQt5.QtCore import Qt
+from PyQt5.QtGui import (
+    QPixmap, QImage, QPalette, QColor, QIntValidator, QDesktopServices
+)
+from PyQt5.QtCore import (
+    Qt, QTimer, QThread, QObject, pyqtSignal, QRunnable, QThreadPool, QUrl
+)
+
+# Qt 5.14+ can consume OpenCV's BGR layout directly, which skips a full
+# BGR->RGB conversion per preview refresh; older Qt falls back to cvtColor
+_BGR888 = getattr(QImage, 'Format_BGR888', None)
+
+# Numba is optional; when it is missing the numpy compositing path is used
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+if njit is not None:
+    @njit(parallel=True, cache=True, fastmath=True)
+    def _apply_visibility(label_map, visible, original, out):
+        """Writes original where the pixel's cluster is visible, else zero"""
+        height, width = label_map.shape
+        for y in prange(height):
+            for x in range(width):
+                if visible[label_map[y, x]]:
+                    out[y, x, 0] = original[y, x, 0]
+                    out[y, x, 1] = original[y, x, 1]
+                    out[y, x, 2] = original[y, x, 2]
+                else:
+                    out[y, x, 0] = 0
+                    out[y, x, 1] = 0
+                    out[y, x, 2] = 0
+else:
+    _apply_visibility = None
+
+# Qt's global thread pool also backs internal work such as smooth pixmap
+# scaling, which the GUI thread blocks on while PyQt holds the GIL; a
+# Python runnable occupying every pool thread then can never re-acquire
+# the GIL and the app deadlocks. The app's own runnables therefore get a
+# dedicated pool and never touch QThreadPool.globalInstance().
+_job_pool = None
+
+def _python_job_pool():
+    """Returns the shared dedicated pool for the app's Python runnables"""
+    global _job_pool
+    if _job_pool is None:
+        _job_pool = QThreadPool()
+    return _job_pool
+
+# Stylesheets built once at import and applied once per top-level widget;
+# Qt's style cascade then covers the children, instead of parsing a QSS
+# string per widget on every dialog open
+FILTER_DIALOG_STYLE = """
+    QGroupBox {
+        background-color: #ffffff;
+        border: 2px solid #e0e0e0;
+        border-radius: 6px;
+        margin-top: 1ex;
+        padding: 10px;
+        color: #333333;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 5px;
+    }
+    QComboBox {
+        padding: 5px;
+        border: 2px solid #e0e0e0;
+        border-radius: 4px;
+        background-color: white;
+        color: #333333;
+        min-width: 150px;
+    }
+    QComboBox:hover {
+        border-color: #4a90e2;
+    }
+    QComboBox::drop-down {
+        border: none;
+        padding-right: 5px;
+    }
+    QSpinBox, QDoubleSpinBox {
+        padding: 5px;
+        border: 2px solid #e0e0e0;
+        border-radius: 4px;
+        background-color: white;
+        color: #333333;
+        min-width: 80px;
+    }
+    QSpinBox:hover, QDoubleSpinBox:hover {
+        border-color: #4a90e2;
+    }
+    QSpinBox::up-button, QDoubleSpinBox::up-button {
+        min-width: 16px;
+        min-height: 12px;
+        margin-top: 1px;
+        margin-right: 1px;
+        background: #f5f5f5;
+    }
+    QSpinBox::down-button, QDoubleSpinBox::down-button {
+        min-width: 16px;
+        min-height: 12px;
+        margin-bottom: 1px;
+        margin-right: 1px;
+        background: #f5f5f5;
+    }
+    QSpinBox::up-button:hover, QDoubleSpinBox::up-button:hover,
+    QSpinBox::down-button:hover, QDoubleSpinBox::down-button:hover {
+        background: #e0e0e0;
+    }
+    QSpinBox::up-button:pressed, QDoubleSpinBox::up-button:pressed,
+    QSpinBox::down-button:pressed, QDoubleSpinBox::down-button:pressed {
+        background: #d0d0d0;
+    }
+    QPushButton {
+        padding: 8px 16px;
+        border: 2px solid #4a90e2;
+        border-radius: 4px;
+        background-color: white;
+        color: #4a90e2;
+        min-width: 80px;
+    }
+    QPushButton:hover {
+        background-color: #4a90e2;
+        color: white;
+    }
+    QPushButton:pressed {
+        background-color: #357abd;
+        border-color: #357abd;
+    }
+"""
+
+MAIN_WINDOW_STYLE = """
+    QMainWindow {
+        background-color: white;
+    }
+    QWidget {
+        background-color: white;
+        color: #333333;
+    }
+    QLabel {
+        color: #333333;
+    }
+    QLabel#imageLabel {
+        background-color: #ffffff;
+        border: 2px solid #e0e0e0;
+        border-radius: 8px;
+        padding: 10px;
+        color: #333333;
+    }
+    QPushButton {
+        padding: 10px 20px;
+        border: 2px solid #4a90e2;
+        border-radius: 6px;
+        background-color: #ffffff;
+        color: #4a90e2;
+        font-weight: bold;
+        min-width: 120px;
+    }
+    QPushButton:hover {
+        background-color: #4a90e2;
+        color: white;
+    }
+    QPushButton:pressed {
+        background-color: #357abd;
+        border-color: #357abd;
+    }
+    QPushButton:disabled {
+        background-color: #f5f5f5;
+        border-color: #cccccc;
+        color: #999999;
+    }
+    QGroupBox {
+        background-color: #ffffff;
+        border: 2px solid #e0e0e0;
+        border-radius: 6px;
+        margin-top: 1ex;
+        color: #333333;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 5px;
+    }
+    QLineEdit {
+        padding: 5px;
+        border: 2px solid #e0e0e0;
+        border-radius: 4px;
+        background-color: white;
+        color: #333333;
+    }
+    QLineEdit:focus {
+        border-color: #4a90e2;
+    }
+    QSlider::groove:horizontal {
+        border: 1px solid #e0e0e0;
+        height: 8px;
+        background: #f5f5f5;
+        margin: 2px 0;
+        border-radius: 4px;
+    }
+    QSlider::handle:horizontal {
+        background: #4a90e2;
+        border: 2px solid #4a90e2;
+        width: 18px;
+        margin: -6px 0;
+        border-radius: 9px;
+    }
+    QSlider::handle:horizontal:hover {
+        background: #357abd;
+        border-color: #357abd;
+    }
+"""
 
 class ColorSwatch(QFrame):
     """A custom widget that displays a colored square representing a cluster's color"""
@@ -40,59 +253,91 @@ class ClusterInfo(QWidget):
         
         self.setLayout(layout)
 
+class FilterWorker(QObject):
+    """Runs preview filter computations off the GUI thread"""
+    finished = pyqtSignal(int, object)
+
+    def run(self, request_id, filter_func, image):
+        """Executes a filter request and emits the result with its id"""
+        try:
+            result = filter_func(image)
+        except Exception:
+            # A failed filter must not kill the preview pipeline; emit
+            # None so the dialog drops the frame and stays responsive
+            result = None
+        self.finished.emit(request_id, result)
+
 class ImageFilterDialog(QDialog):
     """Dialog for applying various image filters before segmentation with smooth transitions"""
+
+    # Emitted to hand a (request id, filter callable, image) job to the worker
+    _filter_requested = pyqtSignal(int, object, object)
+
     def __init__(self, image, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Apply Filters")
         self.setGeometry(300, 300, 800, 600)
         self.setWindowFlags(self.windowFlags() & ~Qt.WindowContextHelpButtonHint)
+        # One dialog-wide stylesheet; parsed once instead of per widget
+        self.setStyleSheet(FILTER_DIALOG_STYLE)
         self.original_image = image.copy()
         self.filtered_image = image.copy()
         self.current_params = {}  # Store current parameter values
+
+        # Previews work on a 30% downscale so parameter tweaks only filter
+        # ~1/11th of the pixels; the full image is filtered once on accept
+        self._preview_src = cv2.resize(
+            self.original_image,
+            None,
+            fx=0.3,
+            fy=0.3,
+            interpolation=cv2.INTER_AREA
+        )
+        self._preview_filtered = self._preview_src.copy()
+
+        # Reusable RGB conversion buffers for the two previews; cvtColor
+        # writes into these instead of allocating on every refresh
+        self._rgb_orig_buf = np.empty_like(self._preview_src)
+        self._rgb_filt_buf = np.empty_like(self._preview_src)
+
+        # Persistent buffer plus QImage header for the filtered preview;
+        # each refresh writes into the same memory Qt reads from, instead
+        # of allocating a fresh QImage per update. The buffer reference is
+        # held on self so the QImage never outlives its pixels.
+        ph, pw = self._preview_src.shape[:2]
+        self._preview_buf = np.empty((ph, pw, 3), dtype=np.uint8)
+        self._preview_qimg = QImage(
+            self._preview_buf.data, pw, ph, 3 * pw,
+            _BGR888 if _BGR888 is not None else QImage.Format_RGB888
+        )
+
+        # Worker thread so heavy filters (bilateral in particular) never
+        # block the GUI; results arrive via _on_filter_finished and stale
+        # out-of-order responses are dropped by request id
+        self._request_id = 0
+        self._worker_thread = QThread(self)
+        self._worker = FilterWorker()
+        self._worker.moveToThread(self._worker_thread)
+        self._filter_requested.connect(self._worker.run)
+        self._worker.finished.connect(self._on_filter_finished)
+        self._worker_thread.start()
+
+        # Debounce timer so rapid parameter changes (typing, arrow clicks)
+        # only trigger a single filter recomputation
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.timeout.connect(self.apply_filter)
         
         # Create main layout
         layout = QVBoxLayout()
         
-        # Create filter controls section with improved styling
+        # Create filter controls section
         controls_group = QGroupBox("Filter Controls")
-        controls_group.setStyleSheet("""
-            QGroupBox {
-                background-color: #ffffff;
-                border: 2px solid #e0e0e0;
-                border-radius: 6px;
-                margin-top: 1ex;
-                padding: 10px;
-                color: #333333;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px;
-            }
-        """)
         controls_layout = QVBoxLayout()
-        
-        # Filter type selection dropdown with improved styling
+
+        # Filter type selection dropdown
         filter_row = QHBoxLayout()
         self.filter_combo = QComboBox()
-        self.filter_combo.setStyleSheet("""
-            QComboBox {
-                padding: 5px;
-                border: 2px solid #e0e0e0;
-                border-radius: 4px;
-                background-color: white;
-                color: #333333;
-                min-width: 150px;
-            }
-            QComboBox:hover {
-                border-color: #4a90e2;
-            }
-            QComboBox::drop-down {
-                border: none;
-                padding-right: 5px;
-            }
-        """)
         self.filter_combo.addItems([
             "No Filter",
             "Gaussian Blur",
@@ -101,6 +346,15 @@ class ImageFilterDialog(QDialog):
             "Sharpen"
         ])
         self.filter_combo.currentTextChanged.connect(self.update_filter_controls)
+        # Dispatch table indexed by combo position; avoids re-reading and
+        # string-comparing the dropdown text on every parameter change
+        self._filters = [
+            self._no_filter,
+            self._gaussian_blur,
+            self._median_blur,
+            self._bilateral_filter,
+            self._sharpen,
+        ]
         filter_row.addWidget(QLabel("Filter Type:"))
         filter_row.addWidget(self.filter_combo)
         filter_row.addStretch()
@@ -115,23 +369,8 @@ class ImageFilterDialog(QDialog):
         controls_group.setLayout(controls_layout)
         layout.addWidget(controls_group)
         
-        # Create preview section with improved styling
+        # Create preview section
         preview_group = QGroupBox("Preview")
-        preview_group.setStyleSheet("""
-            QGroupBox {
-                background-color: #ffffff;
-                border: 2px solid #e0e0e0;
-                border-radius: 6px;
-                margin-top: 1ex;
-                padding: 10px;
-                color: #333333;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px;
-            }
-        """)
         preview_layout = QHBoxLayout()
         
         # Original image preview
@@ -161,34 +400,13 @@ class ImageFilterDialog(QDialog):
         preview_group.setLayout(preview_layout)
         layout.addWidget(preview_group)
         
-        # Add button row with improved styling
+        # Add button row
         button_layout = QHBoxLayout()
-        button_style = """
-            QPushButton {
-                padding: 8px 16px;
-                border: 2px solid #4a90e2;
-                border-radius: 4px;
-                background-color: white;
-                color: #4a90e2;
-                min-width: 80px;
-            }
-            QPushButton:hover {
-                background-color: #4a90e2;
-                color: white;
-            }
-            QPushButton:pressed {
-                background-color: #357abd;
-                border-color: #357abd;
-            }
-        """
-        
+
         reset_button = QPushButton("Reset")
         apply_button = QPushButton("Apply")
         cancel_button = QPushButton("Cancel")
-        
-        for button in [reset_button, apply_button, cancel_button]:
-            button.setStyleSheet(button_style)
-        
+
         reset_button.clicked.connect(self.reset_filters)
         apply_button.clicked.connect(self.accept)
         cancel_button.clicked.connect(self.reject)
@@ -200,68 +418,32 @@ class ImageFilterDialog(QDialog):
         layout.addLayout(button_layout)
         
         self.setLayout(layout)
-        
-        # Initialize the preview images
+
+        # The original never changes, so its preview is rendered exactly
+        # once; update_previews only refreshes the filtered side
+        self.display_preview(self._preview_src, self.original_preview, self._rgb_orig_buf)
         self.update_previews()
 
     def update_parameter(self, param_name, value):
-        """Updates a filter parameter and reapplies the filter"""
+        """Updates a filter parameter and schedules a debounced filter update"""
         self.current_params[param_name] = value
-        self.apply_filter()
+        self._debounce.start(80)
 
     def create_parameter_widget(self, param_name, min_val, max_val, default_val, step=1, is_float=False):
         """Creates a parameter control widget with native Qt arrows"""
         layout = QHBoxLayout()
         layout.addWidget(QLabel(f"{param_name}:"))
-        
-        # Simplified spin box styling using native arrows
-        spin_style = """
-            QSpinBox, QDoubleSpinBox {
-                padding: 5px;
-                border: 2px solid #e0e0e0;
-                border-radius: 4px;
-                background-color: white;
-                color: #333333;
-                min-width: 80px;
-            }
-            QSpinBox:hover, QDoubleSpinBox:hover {
-                border-color: #4a90e2;
-            }
-            QSpinBox::up-button, QDoubleSpinBox::up-button {
-                min-width: 16px;
-                min-height: 12px;
-                margin-top: 1px;
-                margin-right: 1px;
-                background: #f5f5f5;
-            }
-            QSpinBox::down-button, QDoubleSpinBox::down-button {
-                min-width: 16px;
-                min-height: 12px;
-                margin-bottom: 1px;
-                margin-right: 1px;
-                background: #f5f5f5;
-            }
-            QSpinBox::up-button:hover, QDoubleSpinBox::up-button:hover,
-            QSpinBox::down-button:hover, QDoubleSpinBox::down-button:hover {
-                background: #e0e0e0;
-            }
-            QSpinBox::up-button:pressed, QDoubleSpinBox::up-button:pressed,
-            QSpinBox::down-button:pressed, QDoubleSpinBox::down-button:pressed {
-                background: #d0d0d0;
-            }
-        """
-        
+
         if is_float:
             spin = QDoubleSpinBox()
             spin.setDecimals(1)
         else:
             spin = QSpinBox()
-        
+
         spin.setRange(min_val, max_val)
         spin.setValue(default_val)
         spin.setSingleStep(step)
-        spin.setStyleSheet(spin_style)
-        
+
         # Store the current value
         self.current_params[param_name] = default_val
         spin.valueChanged.connect(lambda value: self.update_parameter(param_name, value))
@@ -287,11 +469,7 @@ class ImageFilterDialog(QDialog):
         
         if filter_type == "Gaussian Blur":
             self.params_layout.addLayout(
-                self.create_parameter_widget("Kernel Size", 1, 31, 
-                    self.current_params.get("Kernel Size", 5))
-            )
-            self.params_layout.addLayout(
-                self.create_parameter_widget("Sigma", 0.1, 5.0, 
+                self.create_parameter_widget("Sigma", 0.1, 5.0,
                     self.current_params.get("Sigma", 1.0), 0.1, True)
             )
             
@@ -320,110 +498,163 @@ class ImageFilterDialog(QDialog):
                 self.create_parameter_widget("Amount", 0.1, 5.0,
                     self.current_params.get("Amount", 1.5), 0.1, True)
             )
-        
-        self.apply_filter()
+
+        self._debounce.start(80)
         
     def apply_filter(self):
-        """Applies the selected filter with current parameters to the image"""
-        filter_type = self.filter_combo.currentText()
-        
-        if filter_type == "No Filter":
-            self.filtered_image = self.original_image.copy()
-            
-        elif filter_type == "Gaussian Blur":
-            kernel_size = self.current_params.get("Kernel Size", 5)
-            sigma = self.current_params.get("Sigma", 1.0)
-            kernel_size = kernel_size if kernel_size % 2 == 1 else kernel_size + 1
-            self.filtered_image = cv2.GaussianBlur(
-                self.original_image,
-                (kernel_size, kernel_size),
-                sigma
-            )
-            
-        elif filter_type == "Median Blur":
-            kernel_size = self.current_params.get("Kernel Size", 5)
-            kernel_size = kernel_size if kernel_size % 2 == 1 else kernel_size + 1
-            self.filtered_image = cv2.medianBlur(
-                self.original_image,
-                kernel_size
-            )
-            
-        elif filter_type == "Bilateral Filter":
-            diameter = self.current_params.get("Diameter", 9)
-            sigma_color = self.current_params.get("Sigma Color", 75)
-            sigma_space = self.current_params.get("Sigma Space", 75)
-            self.filtered_image = cv2.bilateralFilter(
-                self.original_image,
-                diameter,
-                sigma_color,
-                sigma_space
-            )
-            
-        elif filter_type == "Sharpen":
-            amount = self.current_params.get("Amount", 1.5)
-            kernel = np.array([
-                [-1, -1, -1],
-                [-1,  9, -1],
-                [-1, -1, -1]
-            ]) * amount
-            self.filtered_image = cv2.filter2D(
-                self.original_image,
-                -1,
-                kernel
-            )
-        
+        """Schedules the selected filter to run on the worker thread"""
+        self._request_id += 1
+        self._filter_requested.emit(
+            self._request_id,
+            self._filters[self.filter_combo.currentIndex()],
+            self._preview_src
+        )
+
+    def _on_filter_finished(self, request_id, filtered):
+        """Receives a worker result, ignoring superseded requests"""
+        if request_id != self._request_id or filtered is None:
+            return
+        self._preview_filtered = filtered
         self.update_previews()
 
-    def update_previews(self):
-        """Updates both preview images with current versions"""
-        # Scale factor for preview images (30% of original size)
-        scale_factor = 0.3
-        
-        # Update original preview
-        preview_original = cv2.resize(
-            self.original_image,
-            None,
-            fx=scale_factor,
-            fy=scale_factor
-        )
-        self.display_preview(preview_original, self.original_preview)
-        
-        # Update filtered preview
-        preview_filtered = cv2.resize(
-            self.filtered_image,
-            None,
-            fx=scale_factor,
-            fy=scale_factor
+    def run_filter(self, image):
+        """Runs the selected filter with current parameters on the given image"""
+        return self._filters[self.filter_combo.currentIndex()](image)
+
+    def _no_filter(self, image):
+        """Passes the image through unchanged"""
+        return image.copy()
+
+    def _gaussian_blur(self, image):
+        """Applies a Gaussian blur driven by sigma alone"""
+        sigma = self.current_params.get("Sigma", 1.0)
+        # ksize=(0,0) lets OpenCV derive the kernel from sigma and pick its
+        # fastest separable path; BORDER_REPLICATE avoids the slower
+        # reflected-border handling
+        return cv2.GaussianBlur(
+            image, (0, 0), sigma, borderType=cv2.BORDER_REPLICATE
         )
-        self.display_preview(preview_filtered, self.filtered_preview)
 
-    def display_preview(self, image, label):
+    def _median_blur(self, image):
+        """Applies a median blur with the current kernel size"""
+        kernel_size = self.current_params.get("Kernel Size", 5)
+        kernel_size = kernel_size if kernel_size % 2 == 1 else kernel_size + 1
+        return cv2.medianBlur(image, kernel_size)
+
+    def _bilateral_filter(self, image):
+        """Applies a bilateral filter with the current diameter and sigmas"""
+        diameter = self.current_params.get("Diameter", 9)
+        sigma_color = self.current_params.get("Sigma Color", 75)
+        sigma_space = self.current_params.get("Sigma Space", 75)
+        return cv2.bilateralFilter(image, diameter, sigma_color, sigma_space)
+
+    def _sharpen(self, image):
+        """Sharpens the image by the current amount via an unsharp mask"""
+        amount = self.current_params.get("Amount", 1.5)
+        # sharp = (1 + amount) * image - amount * blur(image); the separable
+        # Gaussian plus addWeighted is cheaper than a dense filter2D kernel.
+        # The blur stays local: this runs on both the preview worker and
+        # the GUI thread (accept), so shared cached state would race.
+        blurred = cv2.GaussianBlur(image, (0, 0), 1.0)
+        return cv2.addWeighted(image, 1 + amount, blurred, -amount, 0)
+
+    def update_previews(self):
+        """Updates the filtered preview image with the current version"""
+        if self._preview_filtered.shape == self._preview_buf.shape:
+            # Write into the persistent buffer backing the shared QImage
+            if _BGR888 is not None:
+                np.copyto(self._preview_buf, self._preview_filtered)
+            else:
+                cv2.cvtColor(
+                    self._preview_filtered, cv2.COLOR_BGR2RGB,
+                    dst=self._preview_buf
+                )
+            self.filtered_preview.setPixmap(QPixmap.fromImage(self._preview_qimg))
+        else:
+            self.display_preview(
+                self._preview_filtered, self.filtered_preview, self._rgb_filt_buf
+            )
+
+    def display_preview(self, image, label, buf=None):
         """Displays an image in the specified label"""
-        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        height, width, channel = rgb_image.shape
+        if _BGR888 is not None:
+            # Qt consumes the BGR buffer directly; no conversion pass
+            frame = np.ascontiguousarray(image)
+            image_format = _BGR888
+        else:
+            if buf is not None and buf.shape == image.shape:
+                frame = cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=buf)
+            else:
+                frame = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            frame = np.ascontiguousarray(frame)
+            image_format = QImage.Format_RGB888
+        height, width, channel = frame.shape
         bytes_per_line = channel * width
+        # QImage only wraps the numpy memory; copy once so Qt owns the
+        # pixels and the buffer can be reused for the next refresh
         q_image = QImage(
-            rgb_image.data,
+            frame.data,
             width,
             height,
             bytes_per_line,
-            QImage.Format_RGB888
-        )
+            image_format
+        ).copy()
         label.setPixmap(QPixmap.fromImage(q_image))
 
     def reset_filters(self):
         """Resets all filters to their default state"""
         self.filter_combo.setCurrentText("No Filter")
-        self.filtered_image = self.original_image.copy()
+        self._preview_filtered = self._preview_src.copy()
         self.update_previews()
 
+    def accept(self):
+        """Filters the full-resolution image once before closing the dialog"""
+        self.filtered_image = self.run_filter(self.original_image)
+        super().accept()
+
+    def done(self, result):
+        """Stops the worker thread before the dialog closes"""
+        self._worker_thread.quit()
+        self._worker_thread.wait()
+        super().done(result)
+
     def get_filtered_image(self):
         """Returns the current filtered image"""
         return self.filtered_image
 
+class ThumbnailSignals(QObject):
+    """Signal holder for ThumbnailJob (QRunnable cannot emit directly)"""
+    finished = pyqtSignal(int, object)
+
+class ThumbnailJob(QRunnable):
+    """Builds one cluster's colored thumbnail on the global thread pool
+
+    All jobs share one read-only downscaled label map, so per-cluster work
+    is a thumbnail-sized compare plus colorize with no full-resolution
+    intermediates.
+    """
+    def __init__(self, idx, small_label_map, color):
+        super().__init__()
+        self.idx = idx
+        self.small_label_map = small_label_map
+        self.color = color
+        self.signals = ThumbnailSignals()
+
+    def run(self):
+        """Colorizes this cluster's pixels of the label map and emits RGB"""
+        thumb_h, thumb_w = self.small_label_map.shape
+        small_mask = cv2.compare(self.small_label_map, self.idx, cv2.CMP_EQ)
+        # Masked bitwise_and streams through the buffer in one SIMD
+        # pass, with no boolean temporary from a mask == 255 compare
+        color_plane = np.empty((thumb_h, thumb_w, 3), dtype=np.uint8)
+        color_plane[:] = self.color[::-1]
+        thumb_rgb = cv2.bitwise_and(color_plane, color_plane, mask=small_mask)
+        self.signals.finished.emit(self.idx, thumb_rgb)
+
 class UniformColorMaskDialog(QDialog):
     """Dialog for viewing and managing cluster masks"""
-    def __init__(self, masks, dominant_colors, original_image, parent=None, initial_visibility=None):
+    def __init__(self, masks, dominant_colors, original_image, parent=None,
+                 initial_visibility=None, label_map=None):
         super().__init__(parent)
         self.setWindowTitle("Cluster Masks and Visibility")
         self.setGeometry(400, 300, 900, 700)
@@ -436,12 +667,48 @@ class UniformColorMaskDialog(QDialog):
         self.cluster_visibility = initial_visibility or [True] * len(masks)
         self.checkboxes = []
 
+        # A single H x W label map replaces K separate mask comparisons;
+        # derive it from the masks when the caller does not provide one
+        if label_map is None:
+            label_map = np.argmax(
+                np.stack([mask == 255 for mask in masks]), axis=0
+            ).astype(np.uint8)
+        self._label_map = label_map
+
+        # Reusable RGB conversion buffer for the composite preview
+        self._rgb_buf = np.empty_like(original_image)
+
+        # Recent composites keyed by the visibility bitmask (K <= 10 bits)
+        # so toggling back and forth between states reuses earlier results;
+        # holds at most 8 entries and recycles evicted buffers
+        self._vis_cache = {}
+
         layout = QVBoxLayout()
         
         # Create grid layout for masks
         grid = QGridLayout()
         cols = 3  # Number of columns in the grid
-        
+
+        # Thumbnail size fitting 250x250 while preserving aspect ratio;
+        # masks are downscaled to this before colorizing so per-cluster
+        # work is proportional to the thumbnail, not the full image
+        height, width = original_image.shape[:2]
+        scale = min(250 / width, 250 / height)
+        thumb_w = max(1, int(width * scale))
+        thumb_h = max(1, int(height * scale))
+
+        # One nearest-neighbor downscale of the label map serves every
+        # cluster's thumbnail, replacing a full-resolution resize per mask
+        small_label_map = cv2.resize(
+            self._label_map, (thumb_w, thumb_h),
+            interpolation=cv2.INTER_NEAREST
+        )
+
+        # Thumbnails are rendered on the global thread pool so the dialog
+        # opens immediately; placeholders are swapped out as jobs finish
+        self._thumb_labels = []
+        self._thumb_jobs = []
+
         for idx, (mask, color) in enumerate(zip(masks, dominant_colors)):
             # Create container for each mask
             container = QWidget()
@@ -465,20 +732,19 @@ class UniformColorMaskDialog(QDialog):
             info_container.setLayout(info_layout)
             container_layout.addWidget(info_container)
             
-            # Create and add mask image
-            mask_color_image = np.zeros_like(original_image)
-            mask_color_image[mask == 255] = color
-            
-            rgb_mask = cv2.cvtColor(mask_color_image, cv2.COLOR_BGR2RGB)
-            height, width, channel = rgb_mask.shape
-            bytes_per_line = channel * width
-            q_image = QImage(rgb_mask.data, width, height, bytes_per_line, QImage.Format_RGB888)
-            pixmap = QPixmap.fromImage(q_image)
-            
-            mask_label = QLabel()
-            mask_label.setPixmap(pixmap.scaled(250, 250, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+            # Placeholder label; the rendered thumbnail arrives via
+            # _set_thumbnail once its background job completes
+            mask_label = QLabel("Loading...")
             mask_label.setAlignment(Qt.AlignCenter)
+            mask_label.setFixedSize(thumb_w, thumb_h)
             container_layout.addWidget(mask_label)
+            self._thumb_labels.append(mask_label)
+
+            job = ThumbnailJob(idx, small_label_map, color)
+            job.signals.finished.connect(self._set_thumbnail)
+            job.setAutoDelete(False)
+            self._thumb_jobs.append(job)
+            _python_job_pool().start(job)
             
             container.setLayout(container_layout)
             grid.addWidget(container, idx // cols, idx % cols)
@@ -522,27 +788,75 @@ class UniformColorMaskDialog(QDialog):
         self.setLayout(layout)
         self.update_visibility()
 
+    def _set_thumbnail(self, idx, thumb_rgb):
+        """Installs a finished thumbnail on its placeholder label"""
+        height, width, channel = thumb_rgb.shape
+        q_image = QImage(
+            thumb_rgb.data, width, height, channel * width,
+            QImage.Format_RGB888
+        ).copy()
+        self._thumb_labels[idx].setPixmap(QPixmap.fromImage(q_image))
+
     def update_cluster_visibility(self, idx, state):
         """Updates visibility state for a specific cluster"""
         self.cluster_visibility[idx] = state == Qt.Checked
         self.update_visibility()
 
+    def combine_visible(self):
+        """Builds the composite image from the currently visible clusters
+
+        Returns a cached composite buffer; callers that hold on to the
+        result must copy it.
+        """
+        key = sum(bool(v) << i for i, v in enumerate(self.cluster_visibility))
+        cached = self._vis_cache.pop(key, None)
+        if cached is None:
+            if len(self._vis_cache) >= 8:
+                # Recycle the least recently used buffer instead of allocating
+                cached = self._vis_cache.pop(next(iter(self._vis_cache)))
+            else:
+                cached = np.empty_like(self.original_image)
+            visible = np.asarray(self.cluster_visibility, dtype=bool)
+            if _apply_visibility is not None:
+                # Single fused, parallel pass over the label map
+                _apply_visibility(
+                    self._label_map, visible, self.original_image, cached
+                )
+            else:
+                # One gather through the label map yields every pixel's
+                # visibility flag in a single streaming pass
+                visible_pixels = visible[self._label_map]
+                np.multiply(
+                    self.original_image,
+                    visible_pixels[:, :, None],
+                    out=cached,
+                    casting='unsafe'
+                )
+        # Re-insert so dict order tracks recency
+        self._vis_cache[key] = cached
+        return cached
+
     def update_visibility(self):
         """Updates the preview image based on current visibility settings"""
-        combined_image = np.zeros_like(self.original_image)
-        for idx, (mask, is_visible) in enumerate(zip(self.masks, self.cluster_visibility)):
-            if is_visible:
-                combined_image[mask == 255] = self.original_image[mask == 255]
-
-        self.display_preview(combined_image)
+        self.display_preview(self.combine_visible())
 
     def display_preview(self, image):
         """Displays the preview image with proper scaling"""
-        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        height, width, channel = rgb_image.shape
+        if _BGR888 is not None:
+            # Qt consumes the BGR buffer directly; no conversion pass
+            frame = np.ascontiguousarray(image)
+            image_format = _BGR888
+        else:
+            frame = cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+            frame = np.ascontiguousarray(frame)
+            image_format = QImage.Format_RGB888
+        height, width, channel = frame.shape
         bytes_per_line = channel * width
-        q_image = QImage(rgb_image.data, width, height, bytes_per_line, QImage.Format_RGB888)
+        # Copy once so Qt owns the pixels and the buffer can be reused
+        q_image = QImage(frame.data, width, height, bytes_per_line, image_format).copy()
         pixmap = QPixmap.fromImage(q_image)
+        # This preview shows real photographic content, so keep smooth
+        # scaling; nearest-neighbor downscale aliases visibly here
         self.preview_image.setPixmap(pixmap.scaled(
             self.preview_image.size(),
             Qt.KeepAspectRatio,
@@ -558,16 +872,128 @@ class UniformColorMaskDialog(QDialog):
 
     def apply_visibility(self):
         """Applies current visibility settings to main window"""
-        combined_image = np.zeros_like(self.original_image)
-        for idx, (mask, is_visible) in enumerate(zip(self.masks, self.cluster_visibility)):
-            if is_visible:
-                combined_image[mask == 255] = self.original_image[mask == 255]
+        combined_image = self.combine_visible().copy()
 
         self.parent.segmented_image = combined_image
         self.parent.cluster_visibility = self.cluster_visibility.copy()
         self.parent.display_image(combined_image)
         self.close()
         
+class SegmentSignals(QObject):
+    """Signal holder for SegmentWorker (QRunnable cannot emit directly)"""
+    finished = pyqtSignal(object, object)
+    failed = pyqtSignal(str)
+
+class SegmentWorker(QRunnable):
+    """Runs k-means over the image's color histogram off the GUI thread
+
+    Pixels are quantized to 6-bit Lab and collapsed to (unique color,
+    count) pairs, so each clustering pass touches at most 2^18 weighted
+    points instead of every pixel, and the per-pixel labels fall out of
+    the inverse map with a single gather.
+    """
+    def __init__(self, data, k, last_centers=None):
+        super().__init__()
+        self.data = data
+        self.k = k
+        self.last_centers = last_centers
+        self.signals = SegmentSignals()
+
+    def run(self):
+        """Clusters the pixel data and emits (labels, centers) or an error"""
+        try:
+            # Collapse the image to its unique 6-bit Lab colors: natural
+            # images hold far fewer distinct colors than pixels, so the
+            # weighted histogram is a much smaller clustering problem with
+            # the same dominant colors
+            lab = cv2.cvtColor(self.data.reshape(-1, 1, 3), cv2.COLOR_BGR2Lab)
+            quantized = lab.reshape(-1, 3) >> 2
+            uniq, inverse, counts = np.unique(
+                quantized, axis=0, return_inverse=True, return_counts=True)
+            points = uniq.astype(np.float32)
+            weights = counts.astype(np.float32)
+
+            # Flat or synthetic images can hold fewer unique quantized
+            # colors than requested clusters, and cv2.kmeans requires at
+            # least K points; clamp here and pad the centers back up to
+            # k afterwards so the rest of the app still sees k clusters
+            effective_k = min(self.k, len(points))
+
+            if len(points) == 1:
+                # A fully flat image: cv2.kmeans would read a single-row
+                # matrix as three 1-D samples, so skip it and place every
+                # pixel in cluster 0 with the one color as its center
+                color_labels = np.zeros(1, dtype=np.int32)
+                centers = points
+            else:
+                # k-means++ seeding makes one attempt near-optimal for
+                # natural image colors; 30 iterations is ample at eps 1.0
+                criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 1.0)
+                attempts = 1
+
+                # Warm start: when a previous run with the same k exists,
+                # project its BGR centers into quantized Lab and seed the
+                # labels from them so Lloyd converges in a few iterations
+                flags = cv2.KMEANS_PP_CENTERS
+                best_labels = None
+                if (self.last_centers is not None
+                        and len(self.last_centers) == effective_k == self.k):
+                    prev = cv2.cvtColor(
+                        self.last_centers.reshape(-1, 1, 3), cv2.COLOR_BGR2Lab)
+                    prev = (prev.reshape(-1, 3) >> 2).astype(np.float32)
+                    diffs = points[:, None, :] - prev[None, :, :]
+                    best_labels = (diffs ** 2).sum(axis=2).argmin(axis=1).astype(np.int32)
+                    flags = cv2.KMEANS_USE_INITIAL_LABELS
+
+                _, _, centers = cv2.kmeans(
+                    points,
+                    effective_k,
+                    best_labels,
+                    criteria,
+                    attempts,
+                    flags
+                )
+
+                # cv2.kmeans weighs every unique color equally, which lets
+                # rare colors pull centers as hard as dominant ones; a few
+                # count-weighted Lloyd steps fold the pixel frequencies back in
+                for _ in range(10):
+                    dists = ((points[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+                    color_labels = dists.argmin(axis=1)
+                    totals = np.maximum(
+                        np.bincount(color_labels, weights=weights, minlength=effective_k), 1.0)
+                    moved = np.empty_like(centers)
+                    for c in range(3):
+                        moved[:, c] = np.bincount(
+                            color_labels, weights=points[:, c] * weights,
+                            minlength=effective_k) / totals
+                    shift = np.abs(moved - centers).max()
+                    centers = moved
+                    if shift < 1.0:
+                        break
+
+            # Pad duplicate centers when the image had fewer colors than
+            # clusters; the extra clusters simply come out empty, matching
+            # how plain k-means degenerates on such images
+            if effective_k < self.k:
+                centers = np.vstack([
+                    centers,
+                    np.repeat(centers[-1:], self.k - effective_k, axis=0)
+                ])
+
+            # Every pixel inherits its unique color's cluster through the
+            # inverse map; no per-pixel distance pass is needed
+            labels = color_labels[inverse].astype(np.int32)
+
+            # Dequantize the Lab centers and hand back displayable BGR
+            lab_centers = np.clip(centers * 4.0 + 2.0, 0, 255).astype(np.uint8)
+            bgr_centers = cv2.cvtColor(
+                lab_centers.reshape(-1, 1, 3), cv2.COLOR_Lab2BGR).reshape(-1, 3)
+
+            self.signals.finished.emit(labels, bgr_centers)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+
 class KMeansSegmentationApp(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -579,54 +1005,20 @@ class KMeansSegmentationApp(QMainWindow):
         self.setCentralWidget(central_widget)
         main_layout = QVBoxLayout(central_widget)
 
-        # Create image display area with improved styling
+        # Create image display area; styled via the window-wide stylesheet
         self.image_label = QLabel("No image loaded")
+        self.image_label.setObjectName("imageLabel")
         self.image_label.setAlignment(Qt.AlignCenter)
         self.image_label.setMinimumSize(800, 500)
-        self.image_label.setStyleSheet("""
-            QLabel {
-                background-color: #ffffff;
-                border: 2px solid #e0e0e0;
-                border-radius: 8px;
-                padding: 10px;
-                color: #333333;
-            }
-        """)
         main_layout.addWidget(self.image_label)
 
         # Create controls section with improved styling
         controls_widget = QWidget()
         controls_layout = QVBoxLayout(controls_widget)
 
-        # Button row with improved styling
+        # Button row
         button_layout = QHBoxLayout()
-        
-        # Enhanced button style
-        button_style = """
-            QPushButton {
-                padding: 10px 20px;
-                border: 2px solid #4a90e2;
-                border-radius: 6px;
-                background-color: #ffffff;
-                color: #4a90e2;
-                font-weight: bold;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background-color: #4a90e2;
-                color: white;
-            }
-            QPushButton:pressed {
-                background-color: #357abd;
-                border-color: #357abd;
-            }
-            QPushButton:disabled {
-                background-color: #f5f5f5;
-                border-color: #cccccc;
-                color: #999999;
-            }
-        """
-        
+
         self.load_button = QPushButton("Load Image")
         self.filter_button = QPushButton("Apply Filters")
         self.segment_button = QPushButton("Segment Image")
@@ -640,82 +1032,33 @@ class KMeansSegmentationApp(QMainWindow):
         ]
         
         for button in buttons:
-            button.setStyleSheet(button_style)
             button_layout.addWidget(button)
 
         controls_layout.addLayout(button_layout)
         
-        # Enhanced cluster control section
+        # Cluster control section
         cluster_group = QGroupBox("Clustering Settings")
-        cluster_group.setStyleSheet("""
-            QGroupBox {
-                background-color: #ffffff;
-                border: 2px solid #e0e0e0;
-                border-radius: 6px;
-                margin-top: 1ex;
-                color: #333333;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px;
-            }
-        """)
-        
         cluster_layout = QVBoxLayout(cluster_group)
-        
+
         # Add manual cluster input
         manual_input_layout = QHBoxLayout()
         manual_input_label = QLabel("Number of Clusters:")
-        manual_input_label.setStyleSheet("color: #333333;")
         self.cluster_input = QLineEdit()
         self.cluster_input.setValidator(QIntValidator(2, 10))
         self.cluster_input.setText("3")
-        self.cluster_input.setStyleSheet("""
-            QLineEdit {
-                padding: 5px;
-                border: 2px solid #e0e0e0;
-                border-radius: 4px;
-                background-color: white;
-                color: #333333;
-            }
-            QLineEdit:focus {
-                border-color: #4a90e2;
-            }
-        """)
         self.cluster_input.setFixedWidth(60)
         manual_input_layout.addWidget(manual_input_label)
         manual_input_layout.addWidget(self.cluster_input)
         manual_input_layout.addStretch()
         cluster_layout.addLayout(manual_input_layout)
         
-        # Enhanced slider
+        # Slider
         slider_layout = QHBoxLayout()
         self.k_slider = QSlider(Qt.Horizontal)
         self.k_slider.setMinimum(2)
         self.k_slider.setMaximum(10)
         self.k_slider.setValue(3)
-        self.k_slider.setStyleSheet("""
-            QSlider::groove:horizontal {
-                border: 1px solid #e0e0e0;
-                height: 8px;
-                background: #f5f5f5;
-                margin: 2px 0;
-                border-radius: 4px;
-            }
-            QSlider::handle:horizontal {
-                background: #4a90e2;
-                border: 2px solid #4a90e2;
-                width: 18px;
-                margin: -6px 0;
-                border-radius: 9px;
-            }
-            QSlider::handle:horizontal:hover {
-                background: #357abd;
-                border-color: #357abd;
-            }
-        """)
-        
+
         slider_layout.addWidget(self.k_slider)
         cluster_layout.addLayout(slider_layout)
         
@@ -723,10 +1066,7 @@ class KMeansSegmentationApp(QMainWindow):
         main_layout.addWidget(controls_widget)
 
         # Initialize button states and connections
-        self.filter_button.setEnabled(False)
-        self.show_masks_button.setEnabled(False)
-        self.segment_button.setEnabled(False)
-        self.save_button.setEnabled(False)
+        self._set_controls_enabled(False, False)
 
         # Connect signals
         self.load_button.clicked.connect(self.load_image)
@@ -739,28 +1079,46 @@ class KMeansSegmentationApp(QMainWindow):
 
         # Initialize image-related variables
         self.original_image = None
+        self.cluster_image = None
         self.segmented_image = None
+        self.full_size = None
         self.dominant_colors = []
         self.masks = []
+        self.masks_stack = None
+        self.label_map = None
         self.cluster_visibility = []
+        self._segmenting = False
+        self._segment_worker = None
+        self._last_centers = None
 
-        # Set light theme
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: white;
-            }
-            QWidget {
-                background-color: white;
-                color: #333333;
-            }
-            QLabel {
-                color: #333333;
-            }
-        """)
+        # Full-resolution pixmap cache for display_image; window resizes
+        # rescale this instead of rebuilding from the numpy image. A fast
+        # nearest rescale paints immediately and the debounce timer
+        # re-renders smoothly once interaction settles.
+        self._full_pixmap = None
+        self._smooth_timer = QTimer(self)
+        self._smooth_timer.setSingleShot(True)
+        self._smooth_timer.timeout.connect(self._rescale_smooth)
+
+        # Set light theme; one window-wide stylesheet covers all children
+        self.setStyleSheet(MAIN_WINDOW_STYLE)
         
         # Connect the new help button
         self.help_button.clicked.connect(self.open_help_pdf)
         
+    def _open_pdf(self, path):
+        """Opens a PDF through the system handler without blocking the UI"""
+        # QDesktopServices spawns the viewer asynchronously and handles
+        # platform dispatch itself (the old os.system calls blocked the
+        # event loop until the shell returned and broke on quoted paths)
+        if not QDesktopServices.openUrl(QUrl.fromLocalFile(path)):
+            QMessageBox.critical(
+                self,
+                "Error",
+                "Could not open PDF with system viewer.\n"
+                "Please ensure you have a PDF viewer installed."
+            )
+
     def open_help_pdf(self):
         """Opens a PDF file with help documentation, accounting for both script and exe contexts"""
         try:
@@ -771,30 +1129,11 @@ class KMeansSegmentationApp(QMainWindow):
             else:
                 # Running as script
                 app_dir = os.path.dirname(os.path.abspath(__file__))
-                
+
             default_manual = os.path.join(app_dir, "manual.pdf")
-            
+
             if os.path.exists(default_manual):
-                try:
-                    # First try using default system associations
-                    if sys.platform.startswith('darwin'):  # macOS
-                        os.system(f'open "{default_manual}"')
-                    elif sys.platform.startswith('win32'):  # Windows
-                        os.startfile(default_manual)
-                    else:  # Linux and other Unix-like
-                        os.system(f'xdg-open "{default_manual}"')
-                except Exception:
-                    # If system association fails, try alternate methods
-                    try:
-                        import webbrowser
-                        webbrowser.open(default_manual)
-                    except Exception as e:
-                        QMessageBox.critical(
-                            self,
-                            "Error",
-                            f"Could not open PDF with system viewer: {str(e)}\n"
-                            "Please ensure you have a PDF viewer installed."
-                        )
+                self._open_pdf(default_manual)
             else:
                 # Manual not found in application directory
                 QMessageBox.warning(
@@ -830,21 +1169,12 @@ class KMeansSegmentationApp(QMainWindow):
                                 "The manual has been copied to the application directory for future use."
                             )
                             # Open the copied manual
-                            if sys.platform.startswith('darwin'):
-                                os.system(f'open "{default_manual}"')
-                            elif sys.platform.startswith('win32'):
-                                os.startfile(default_manual)
-                            else:
-                                os.system(f'xdg-open "{default_manual}"')
-                        except Exception as e:
+                            self._open_pdf(default_manual)
+                        except Exception:
                             # If copy fails, just open the selected file
-                            if sys.platform.startswith('darwin'):
-                                os.system(f'open "{file_path}"')
-                            elif sys.platform.startswith('win32'):
-                                os.startfile(file_path)
-                            else:
-                                os.system(f'xdg-open "{file_path}"')
-                                
+                            self._open_pdf(file_path)
+
+
         except Exception as e:
             QMessageBox.critical(
                 self,
@@ -852,16 +1182,33 @@ class KMeansSegmentationApp(QMainWindow):
                 f"Failed to handle PDF: {str(e)}"
             )
             
+    def _set_controls_enabled(self, has_image, has_segmentation):
+        """Applies the button enable states in one batched pass"""
+        self.filter_button.setEnabled(has_image)
+        self.segment_button.setEnabled(has_image)
+        self.show_masks_button.setEnabled(has_segmentation)
+        self.save_button.setEnabled(has_segmentation)
+
     def update_cluster_input(self, value):
         """Updates the manual input when slider changes"""
+        # Block the mirrored widget's signals so the slider/input pair
+        # does not re-trigger each other in a loop
+        self.cluster_input.blockSignals(True)
         self.cluster_input.setText(str(value))
+        self.cluster_input.blockSignals(False)
 
     def update_slider(self, text):
         """Updates the slider when manual input changes"""
-        if text and text.isdigit():
+        # One int() attempt instead of an isdigit() scan plus a second
+        # full parse; this runs on every keystroke
+        try:
             value = int(text)
-            if 2 <= value <= 10:
-                self.k_slider.setValue(value)
+        except ValueError:
+            return
+        if 2 <= value <= 10:
+            self.k_slider.blockSignals(True)
+            self.k_slider.setValue(value)
+            self.k_slider.blockSignals(False)
 
     def load_image(self):
         """Handles image loading with error checking and user feedback"""
@@ -874,41 +1221,43 @@ class KMeansSegmentationApp(QMainWindow):
         
         if file_path:
             try:
-                # Load and validate image
-                self.original_image = cv2.imread(file_path)
+                # Pixels beyond ~2x the display area only cost memory and
+                # clustering time, so oversized JPEGs are decoded at
+                # reduced resolution up front and everything else is
+                # pre-sized after the fact. The source size is kept so
+                # masks can still be exported at full resolution.
+                label_size = self.image_label.size()
+                bound = 2 * max(label_size.width(), label_size.height())
+                self.original_image, self.full_size = self._read_image(
+                    file_path, bound)
                 if self.original_image is None:
                     raise ValueError("Unable to load image")
-                
-                # Check image dimensions
+
                 height, width = self.original_image.shape[:2]
-                if height * width > 4000 * 3000:  # Limit image size to prevent performance issues
-                    # Resize while maintaining aspect ratio
-                    scale = min(4000/width, 3000/height)
-                    new_width = int(width * scale)
-                    new_height = int(height * scale)
-                    self.original_image = cv2.resize(
+                if max(width, height) > bound:
+                    scale = bound / max(width, height)
+                    self.original_image = self._downscale(
                         self.original_image,
-                        (new_width, new_height),
-                        interpolation=cv2.INTER_AREA
+                        int(width * scale),
+                        int(height * scale)
                     )
-                    QMessageBox.information(
-                        self,
-                        "Image Resized",
-                        "Image has been resized to improve performance while maintaining quality."
-                    )
-                
+
+                # Clustering runs on a further bounded copy; labels are
+                # upsampled back to full resolution afterwards
+                self.cluster_image = self._make_cluster_image(self.original_image)
+
                 self.display_image(self.original_image)
-                self.filter_button.setEnabled(True)
-                self.segment_button.setEnabled(True)
                 self.setWindowTitle(f"K-means Image Segmentation - {file_path}")
-                
+
                 # Reset previous segmentation results
                 self.segmented_image = None
                 self.dominant_colors = []
                 self.masks = []
+                self.masks_stack = None
+                self.label_map = None
                 self.cluster_visibility = []
-                self.show_masks_button.setEnabled(False)
-                self.save_button.setEnabled(False)
+                self._last_centers = None
+                self._set_controls_enabled(True, False)
                 
             except Exception as e:
                 QMessageBox.critical(
@@ -917,30 +1266,150 @@ class KMeansSegmentationApp(QMainWindow):
                     f"Failed to load image: {str(e)}"
                 )
 
+    @staticmethod
+    def _jpeg_size(data):
+        """Reads (width, height) from JPEG headers without decoding
+
+        Walks the marker segments up to the start-of-frame; returns None
+        when no frame header is found before the entropy-coded data.
+        """
+        i = 2
+        end = len(data) - 9
+        while i < end:
+            if data[i] != 0xFF:
+                i += 1
+                continue
+            marker = data[i + 1]
+            if marker == 0xFF:
+                # JFIF allows 0xFF fill bytes before a marker; rescan
+                # from the second 0xFF instead of consuming a length
+                i += 1
+                continue
+            if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+                i += 2
+                continue
+            if marker in (0xD9, 0xDA):
+                break
+            if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                height = (int(data[i + 5]) << 8) | int(data[i + 6])
+                width = (int(data[i + 7]) << 8) | int(data[i + 8])
+                return width, height
+            i += 2 + ((int(data[i + 2]) << 8) | int(data[i + 3]))
+        return None
+
+    @staticmethod
+    def _read_image(path, bound):
+        """Loads an image, decoding oversized JPEGs at reduced resolution
+
+        libjpeg scales inside the inverse DCT, so asking for a half- or
+        quarter-size decode skips most of the transform work that a full
+        decode plus resize would do. The reduction factor is chosen so
+        the decoded image still covers `bound` pixels on its long side.
+        Returns (pixels, full (width, height)) so callers keep the source
+        dimensions even when the decode was reduced.
+        """
+        if path.lower().endswith(('.jpg', '.jpeg')):
+            data = np.fromfile(path, dtype=np.uint8)
+            full_size = KMeansSegmentationApp._jpeg_size(data)
+            flag = cv2.IMREAD_COLOR
+            if full_size is not None:
+                longest = max(full_size)
+                if longest >= 4 * bound:
+                    flag = cv2.IMREAD_REDUCED_COLOR_4
+                elif longest >= 2 * bound:
+                    flag = cv2.IMREAD_REDUCED_COLOR_2
+            image = cv2.imdecode(data, flag)
+            if image is not None and full_size is None:
+                height, width = image.shape[:2]
+                full_size = (width, height)
+            return image, full_size
+
+        image = cv2.imread(path)
+        if image is None:
+            return None, None
+        height, width = image.shape[:2]
+        return image, (width, height)
+
+    @staticmethod
+    def _downscale(image, new_width, new_height):
+        """Downscales with a pre-blur so large ratios do not alias"""
+        height, width = image.shape[:2]
+        scale = new_width / width
+        if scale < 0.5:
+            # INTER_AREA's kernel does not widen with the ratio, so blur
+            # proportionally to the decimation first
+            image = cv2.GaussianBlur(image, (0, 0), 0.5 / scale)
+        return cv2.resize(
+            image, (new_width, new_height), interpolation=cv2.INTER_AREA
+        )
+
+    def _make_cluster_image(self, image):
+        """Returns a copy of the image bounded to 1024px for clustering"""
+        height, width = image.shape[:2]
+        scale = 1024 / max(height, width)
+        if scale >= 1.0:
+            return image
+        return self._downscale(
+            image, int(width * scale), int(height * scale)
+        )
+
     def display_image(self, image):
         """Displays an image in the GUI with proper scaling and aspect ratio"""
-        if image is not None:
-            rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-            height, width, channel = rgb_image.shape
-            bytes_per_line = channel * width
-            
-            q_image = QImage(
-                rgb_image.data,
-                width,
-                height,
-                bytes_per_line,
-                QImage.Format_RGB888
-            )
-            
-            # Calculate scaling while preserving aspect ratio
-            label_size = self.image_label.size()
-            scaled_pixmap = QPixmap.fromImage(q_image).scaled(
-                label_size,
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
-            
-            self.image_label.setPixmap(scaled_pixmap)
+        if image is None:
+            return
+
+        if _BGR888 is not None:
+            # Qt consumes the BGR buffer directly; no conversion pass
+            frame = np.ascontiguousarray(image)
+            image_format = _BGR888
+        else:
+            frame = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            image_format = QImage.Format_RGB888
+
+        height, width, channel = frame.shape
+        bytes_per_line = channel * width
+
+        q_image = QImage(
+            frame.data,
+            width,
+            height,
+            bytes_per_line,
+            image_format
+        )
+
+        # Keep the numpy buffer alive while Qt holds the pointer; the
+        # cached full-resolution pixmap serves all subsequent rescales
+        self._display_buf = frame
+        self._full_pixmap = QPixmap.fromImage(q_image)
+        self._rescale_fast()
+        self._smooth_timer.start(150)
+
+    def _rescale_fast(self):
+        """Paints the cached pixmap with cheap nearest-neighbor scaling"""
+        if self._full_pixmap is None:
+            return
+        self.image_label.setPixmap(self._full_pixmap.scaled(
+            self.image_label.size(),
+            Qt.KeepAspectRatio,
+            Qt.FastTransformation
+        ))
+
+    def _rescale_smooth(self):
+        """Re-renders the cached pixmap smoothly once interaction settles"""
+        if self._full_pixmap is None:
+            return
+        self.image_label.setPixmap(self._full_pixmap.scaled(
+            self.image_label.size(),
+            Qt.KeepAspectRatio,
+            Qt.SmoothTransformation
+        ))
+
+    def resizeEvent(self, event):
+        """Rescales the cached pixmap instead of rebuilding the image"""
+        super().resizeEvent(event)
+        if self._full_pixmap is not None:
+            self._rescale_fast()
+            self._smooth_timer.start(150)
 
     def show_filters(self):
         """Opens the filter dialog"""
@@ -950,76 +1419,89 @@ class KMeansSegmentationApp(QMainWindow):
         dialog = ImageFilterDialog(self.original_image, self)
         if dialog.exec_() == QDialog.Accepted:
             self.original_image = dialog.get_filtered_image()
+            self.cluster_image = self._make_cluster_image(self.original_image)
             self.display_image(self.original_image)
             
             # Reset segmentation results since image has changed
             self.segmented_image = None
             self.dominant_colors = []
             self.masks = []
+            self.masks_stack = None
+            self.label_map = None
             self.cluster_visibility = []
-            self.show_masks_button.setEnabled(False)
-            self.save_button.setEnabled(False)
+            self._set_controls_enabled(True, False)
 
     def segment_image(self):
-        """Performs K-means segmentation with progress feedback"""
-        if self.original_image is None:
+        """Starts K-means segmentation on a background worker"""
+        if self.original_image is None or self._segmenting:
             return
-            
+
         k = int(self.cluster_input.text())
-        
-        # Disable UI during processing
-        self.setEnabled(False)
-        QApplication.processEvents()
-        
-        try:
-            # Prepare data for clustering
-            data = self.original_image.reshape((-1, 3))
-            data = np.float32(data)
-            
-            # Configure K-means parameters
-            criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 100, 0.2)
-            attempts = 10
-            
-            # Perform K-means clustering
-            _, labels, centers = cv2.kmeans(
-                data,
-                k,
-                None,
-                criteria,
-                attempts,
-                cv2.KMEANS_PP_CENTERS
-            )
-            
-            # Convert back to image format
-            centers = np.uint8(centers)
-            segmented_data = centers[labels.flatten()]
-            self.segmented_image = segmented_data.reshape(self.original_image.shape)
-            self.dominant_colors = centers.tolist()
-            
-            # Generate masks for each cluster
-            self.masks = []
-            self.cluster_visibility = []
-            for i in range(k):
-                mask = np.zeros(self.original_image.shape[:2], dtype=np.uint8)
-                mask[labels.reshape(self.original_image.shape[:2]) == i] = 255
-                self.masks.append(mask)
-                self.cluster_visibility.append(True)
-            
-            # Update display
-            self.display_image(self.segmented_image)
-            self.show_masks_button.setEnabled(True)
-            self.save_button.setEnabled(True)
-            
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Segmentation Error",
-                f"Failed to segment image: {str(e)}"
-            )
-        
-        finally:
-            # Re-enable UI
-            self.setEnabled(True)
+
+        # Guard against stacking work from repeated clicks, and freeze
+        # load/filter so the image cannot be swapped under the worker:
+        # its labels are only valid for the image it was started on. The
+        # event loop keeps the rest of the UI responsive.
+        self._segmenting = True
+        self.load_button.setEnabled(False)
+        self._set_controls_enabled(False, False)
+
+        # Hand the worker uint8 pixels; it promotes to float32 piecewise
+        data = self.cluster_image.reshape((-1, 3))
+        worker = SegmentWorker(data, k, self._last_centers)
+        worker.setAutoDelete(False)
+        worker.signals.finished.connect(self._on_segmentation_finished)
+        worker.signals.failed.connect(self._on_segmentation_failed)
+        self._segment_worker = worker
+        _python_job_pool().start(worker)
+
+    def _on_segmentation_finished(self, labels, centers):
+        """Builds masks and updates the display from worker results"""
+        k = centers.shape[0]
+
+        # Remember the BGR centers to warm-start the next run
+        self._last_centers = centers.copy()
+
+        # Labels come back at cluster_image resolution; a nearest-neighbor
+        # upsample restores the full-resolution label map
+        small_labels = labels.reshape(self.cluster_image.shape[:2]).astype(np.uint8)
+        height, width = self.original_image.shape[:2]
+        self.label_map = cv2.resize(
+            small_labels, (width, height), interpolation=cv2.INTER_NEAREST
+        )
+
+        # Convert back to image format with one indexed gather straight
+        # from the 2-D label map; no flattened temporary or reshape
+        centers8 = centers.astype(np.uint8, copy=False)
+        self.segmented_image = centers8[self.label_map]
+        self.dominant_colors = centers8.tolist()
+
+        # Generate all cluster masks into the contiguous [k, H, W] stack;
+        # cv2.compare emits 255/0 uint8 masks directly through its SIMD
+        # path, with no bool intermediate from a broadcast equality
+        height, width = self.label_map.shape
+        self.masks_stack = np.empty((k, height, width), dtype=np.uint8)
+        for i in range(k):
+            cv2.compare(self.label_map, i, cv2.CMP_EQ, dst=self.masks_stack[i])
+        self.masks = [self.masks_stack[i] for i in range(k)]
+        self.cluster_visibility = [True] * k
+
+        # Update display
+        self.display_image(self.segmented_image)
+        self.load_button.setEnabled(True)
+        self._set_controls_enabled(True, True)
+        self._segmenting = False
+
+    def _on_segmentation_failed(self, message):
+        """Reports a segmentation failure and re-enables the controls"""
+        self.load_button.setEnabled(True)
+        self._set_controls_enabled(True, self.segmented_image is not None)
+        self._segmenting = False
+        QMessageBox.critical(
+            self,
+            "Segmentation Error",
+            f"Failed to segment image: {message}"
+        )
 
     def save_segments(self):
         """Saves the segmented image with error handling"""
@@ -1061,23 +1543,59 @@ class KMeansSegmentationApp(QMainWindow):
                     masks_dir = f"{base_path}_masks"
                     os.makedirs(masks_dir, exist_ok=True)
                     
-                    # Save each visible mask
-                    for idx, (mask, color, is_visible) in enumerate(zip(
-                        self.masks,
+                    # Masks are flat cluster colors, so they can be written
+                    # at the original file resolution by upsampling the
+                    # label map - no full-resolution pixels needed in RAM
+                    label_size = (self.label_map.shape[1], self.label_map.shape[0])
+                    if self.full_size and self.full_size != label_size:
+                        export_labels = cv2.resize(
+                            self.label_map,
+                            self.full_size,
+                            interpolation=cv2.INTER_NEAREST
+                        )
+                    else:
+                        export_labels = self.label_map
+
+                    tasks = []
+                    for idx, (color, is_visible) in enumerate(zip(
                         self.dominant_colors,
                         self.cluster_visibility
                     )):
                         if is_visible:
-                            # Create colored mask
-                            mask_color = np.zeros_like(self.original_image)
-                            mask_color[mask == 255] = color
-                            
-                            # Save mask
                             mask_path = os.path.join(
                                 masks_dir,
                                 f"cluster_{idx + 1}.png"
                             )
-                            cv2.imwrite(mask_path, mask_color)
+                            tasks.append((mask_path, idx, color))
+
+                    # Render each mask inside its write task so only one
+                    # full-size frame per worker thread is ever alive: the
+                    # tasks share a small pool of reusable buffers instead
+                    # of each holding its own H x W x 3 allocation
+                    k = len(self.dominant_colors)
+                    workers = min(len(tasks), os.cpu_count() or 1)
+                    buffers = Queue()
+                    for _ in range(workers):
+                        buffers.put(np.empty(export_labels.shape + (3,), dtype=np.uint8))
+
+                    # Compression level 3 roughly halves encode time for a
+                    # small size cost on these flat-color images
+                    write_params = [cv2.IMWRITE_PNG_COMPRESSION, 3]
+
+                    def write_mask(task):
+                        mask_path, idx, color = task
+                        buf = buffers.get()
+                        try:
+                            palette = np.zeros((k, 3), dtype=np.uint8)
+                            palette[idx] = color
+                            np.take(palette, export_labels, axis=0, out=buf)
+                            cv2.imwrite(mask_path, buf, write_params)
+                        finally:
+                            buffers.put(buf)
+
+                    # PNG deflate releases the GIL, so writes scale across cores
+                    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                        list(executor.map(write_mask, tasks))
                     
                     QMessageBox.information(
                         self,
@@ -1113,7 +1631,8 @@ class KMeansSegmentationApp(QMainWindow):
             self.dominant_colors,
             self.original_image,
             self,
-            self.cluster_visibility
+            self.cluster_visibility,
+            label_map=self.label_map
         )
         dialog.exec_()
 